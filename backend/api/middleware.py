@@ -0,0 +1,82 @@
+import brotli
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_LENGTH = 200
+
+# Brotli's default quality 11 is meant for static assets; 5 compresses
+# better than gzip at a comparable CPU cost for per-request responses
+BROTLI_QUALITY = 5
+
+
+def parse_accept_encoding(header):
+    """Map each content coding in an Accept-Encoding header to its q-value"""
+    encodings = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        encodings[coding] = quality
+    return encodings
+
+
+def choose_encoding(header):
+    """Pick 'br' or 'gzip' for an Accept-Encoding header, or None to send identity"""
+    encodings = parse_accept_encoding(header)
+    wildcard = encodings.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for coding in ('br', 'gzip'):
+        quality = encodings.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress responses with brotli or gzip, honouring Accept-Encoding q-values.
+
+    Follows django.middleware.gzip.GZipMiddleware, which only offers gzip and
+    does not read q-values.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or len(response.content) < MIN_COMPRESS_LENGTH:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            compressed_content = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        else:
+            compressed_content = compress_string(response.content)
+        if len(compressed_content) >= len(response.content):
+            return response
+
+        response.content = compressed_content
+        response['Content-Length'] = str(len(response.content))
+
+        # The compressed body differs byte-wise from the uncompressed one, so a
+        # strong ETag has to be weakened, as GZipMiddleware does
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,57 @@
+import unicodedata
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+# Frozen copy of api.search_document as of this migration, so later changes
+# to the live normalization do not alter what this migration writes.
+COLUMN_SEPARATOR = '\x1f'
+NAME_SEPARATOR = '\x1e'
+
+
+def normalize_search_text(value):
+    decomposed = unicodedata.normalize('NFKD', str(value).casefold())
+    folded = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(folded.split())
+
+
+def build_search_document(data):
+    segments = [
+        normalize_search_text(name).replace(' ', '') + NAME_SEPARATOR + normalize_search_text(value)
+        for name, value in data.items()
+        if value is not None
+    ]
+    return COLUMN_SEPARATOR + COLUMN_SEPARATOR.join(segments) + COLUMN_SEPARATOR
+
+
+def populate_search_documents(apps, schema_editor):
+    DataEntry = apps.get_model('api', 'DataEntry')
+    batch = []
+    for entry in DataEntry.objects.only('id', 'data').iterator(chunk_size=1000):
+        entry.search_document = build_search_document(entry.data or {})
+        batch.append(entry)
+        if len(batch) >= 1000:
+            DataEntry.objects.bulk_update(batch, ['search_document'])
+            batch = []
+    if batch:
+        DataEntry.objects.bulk_update(batch, ['search_document'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_dataentry_data_gin_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataentry',
+            name='search_document',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='dataentry',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_document'], name='search_document_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+def populate_columns(apps, schema_editor):
+    # The original header is not stored for existing files, and XLSX rows
+    # omit empty cells, so use every key present in any of the file's entries,
+    # ordered by the first entry it appears in
+    FileInfo = apps.get_model('api', 'FileInfo')
+    DataEntry = apps.get_model('api', 'DataEntry')
+    with schema_editor.connection.cursor() as cursor:
+        for file_info in FileInfo.objects.all():
+            cursor.execute(
+                f"""
+                SELECT key FROM (
+                    SELECT id, jsonb_object_keys(data) AS key
+                    FROM {DataEntry._meta.db_table}
+                    WHERE file_id = %s
+                ) AS entry_keys
+                GROUP BY key
+                ORDER BY MIN(id), key
+                """,
+                [file_info.id]
+            )
+            file_info.columns = [row[0] for row in cursor.fetchall()]
+            file_info.save(update_fields=['columns'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_dataentry_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileinfo',
+            name='columns',
+            field=models.JSONField(default=list),
+        ),
+        migrations.RunPython(populate_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_fileinfo_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileinfo',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -6,12 +6,17 @@ class FileInfo(models.Model):
     upload_date = models.DateTimeField(auto_now_add=True)
     row_count = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    # Header of the uploaded file, in file order
+    columns = models.JSONField(default=list)
+    # Incremented whenever entries are added, so cached search results can be revalidated
+    version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"{self.filename} (uploaded {self.upload_date})"
 
 class DataEntry(models.Model):
     data = models.JSONField()
+    search_document = models.TextField(blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     file = models.ForeignKey(FileInfo, on_delete=models.CASCADE, related_name='entries', null=True, blank=True)
 
@@ -22,4 +27,6 @@ class DataEntry(models.Model):
         indexes = [
             # GIN index for the entire JSON field
             GinIndex(fields=['data'], name='data_gin_idx'),
+            # Trigram index for substring search across all columns
+            GinIndex(fields=['search_document'], name='search_document_trgm_idx', opclasses=['gin_trgm_ops']),
         ] 
\ No newline at end of file
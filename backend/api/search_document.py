@@ -0,0 +1,55 @@
+import re
+import unicodedata
+
+# A search document is a sequence of COLUMN_SEPARATOR + column name +
+# NAME_SEPARATOR + value segments, closed by a final COLUMN_SEPARATOR.
+# str.split() treats both separators as whitespace, so normalized names,
+# values and search terms can never contain them and a match cannot span
+# two columns.
+COLUMN_SEPARATOR = '\x1f'
+NAME_SEPARATOR = '\x1e'
+
+
+def normalize_search_text(value):
+    """Casefold, strip accents and collapse whitespace"""
+    decomposed = unicodedata.normalize('NFKD', str(value).casefold())
+    folded = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(folded.split())
+
+
+def normalize_column_name(name):
+    """Normalize a column name, ignoring whitespace so 'Foreign Company' equals 'ForeignCompany'"""
+    return normalize_search_text(name).replace(' ', '')
+
+
+def build_search_document(data):
+    """Concatenate the normalized columns of a row into one searchable string"""
+    segments = [
+        normalize_column_name(name) + NAME_SEPARATOR + normalize_search_text(value)
+        for name, value in data.items()
+        if value is not None
+    ]
+    return COLUMN_SEPARATOR + COLUMN_SEPARATOR.join(segments) + COLUMN_SEPARATOR
+
+
+def search_pattern(term, fields=None):
+    """Build a regex matching documents whose value contains term.
+
+    With fields, only the values of those columns are considered, otherwise
+    any column's value. The pattern is valid for both Python and PostgreSQL.
+    """
+    normalized_term = normalize_search_text(term)
+    if not normalized_term:
+        raise ValueError('Search term has no searchable text')
+
+    value_pattern = '[^' + COLUMN_SEPARATOR + ']*' + re.escape(normalized_term)
+    if fields is None:
+        return NAME_SEPARATOR + value_pattern
+
+    names = sorted({normalize_column_name(field) for field in fields})
+    return (
+        COLUMN_SEPARATOR
+        + '(' + '|'.join(re.escape(name) for name in names) + ')'
+        + NAME_SEPARATOR
+        + value_pattern
+    )
@@ -0,0 +1,313 @@
+import re
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import brotli
+from orjson import loads as orjson_loads
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from .middleware import choose_encoding
+from .models import DataEntry, FileInfo
+from .search_document import (
+    COLUMN_SEPARATOR,
+    NAME_SEPARATOR,
+    build_search_document,
+    normalize_search_text,
+    search_pattern,
+)
+from .views.search_data import _compact_columns, _compact_rows
+from .views.upload_file import _create_entries
+
+
+def baseline_match(data, term, fields):
+    """Per-field icontains as the search used to run it, with PostgreSQL UPPER semantics"""
+    for field in fields:
+        for field_name in (field, field.replace(' ', '')):
+            value = data.get(field_name)
+            if value is not None and term.upper() in str(value).upper():
+                return True
+    return False
+
+
+def document_match(data, term, fields=None):
+    return re.search(search_pattern(term, fields), build_search_document(data)) is not None
+
+
+class NormalizeSearchTextTests(SimpleTestCase):
+    def test_folds_accents(self):
+        self.assertEqual(normalize_search_text('Café Müller'), 'cafe muller')
+
+    def test_collapses_whitespace(self):
+        self.assertEqual(normalize_search_text('  Indian \t\n  Port  '), 'indian port')
+
+    def test_casefolds_final_sigma(self):
+        # str.lower() would give 'οδος' here, which no longer matches 'οδοσα'
+        self.assertEqual(normalize_search_text('ΟΔΟΣ'), 'οδοσ')
+        self.assertEqual(normalize_search_text('ΟΔΟΣΑ'), 'οδοσα')
+
+    def test_removes_separators(self):
+        self.assertEqual(COLUMN_SEPARATOR.split(), [])
+        self.assertEqual(NAME_SEPARATOR.split(), [])
+        self.assertEqual(normalize_search_text(f'a{COLUMN_SEPARATOR}b{NAME_SEPARATOR}c'), 'a b c')
+
+    def test_converts_non_strings(self):
+        self.assertEqual(normalize_search_text(42), '42')
+
+
+class BuildSearchDocumentTests(SimpleTestCase):
+    def test_builds_column_segments(self):
+        document = build_search_document({'Indian Company': 'Açme  Ltd', 'IEC': '123'})
+        self.assertEqual(document, '\x1findiancompany\x1eacme ltd\x1fiec\x1e123\x1f')
+
+    def test_skips_none_values(self):
+        self.assertEqual(build_search_document({'A': None, 'B': 'x'}), '\x1fb\x1ex\x1f')
+
+    def test_empty_row(self):
+        self.assertEqual(build_search_document({}), '\x1f\x1f')
+
+
+class SearchPatternTests(SimpleTestCase):
+    data = {
+        'Product': 'Café Crème',
+        'Foreign Company': 'ΟΔΟΣΑ Shipping',
+        'Indian Port': 'Nhava  Sheva',
+        'HS Code': '0901',
+    }
+
+    def test_any_column(self):
+        self.assertTrue(document_match(self.data, 'cafe'))
+        self.assertTrue(document_match(self.data, '0901'))
+        self.assertFalse(document_match(self.data, 'tea'))
+
+    def test_any_column_ignores_column_names(self):
+        self.assertFalse(document_match(self.data, 'product'))
+
+    def test_match_cannot_span_columns(self):
+        self.assertFalse(document_match(self.data, 'creme ο'))
+        self.assertFalse(document_match(self.data, 'sheva 0901'))
+
+    def test_fields_restricts_columns(self):
+        self.assertTrue(document_match(self.data, 'shipping', ['Foreign Company']))
+        self.assertFalse(document_match(self.data, 'shipping', ['Product']))
+
+    def test_fields_accepts_names_without_spaces(self):
+        self.assertTrue(document_match(self.data, 'sheva', ['IndianPort']))
+
+    def test_modes_share_matching_semantics(self):
+        for term in ('cafe', 'CAFÉ', 'nhava sheva', 'οδοσ'):
+            self.assertEqual(document_match(self.data, term), document_match(self.data, term, list(self.data)))
+
+    def test_fields_never_excludes_baseline_matches(self):
+        fields = ['Product', 'ForeignCompany', 'Indian Port', 'HS Code']
+        for term in ('Café', 'crème', 'ΟΔΟΣ', 'odos', 'Nhava  Sheva', 'SHIPPING', '090', 'é C'):
+            if baseline_match(self.data, term, fields):
+                self.assertTrue(document_match(self.data, term, fields), term)
+
+    def test_escapes_regex_characters(self):
+        data = {'Product': 'Widget (v2.0) [A+B]'}
+        self.assertTrue(document_match(data, '(v2.0) [a+b]'))
+        self.assertFalse(document_match(data, 'v2x0'))
+
+    def test_rejects_terms_without_text(self):
+        for term in ('', '   ', COLUMN_SEPARATOR, '\t\n'):
+            with self.assertRaises(ValueError):
+                search_pattern(term)
+
+
+def make_entry(id, data):
+    return SimpleNamespace(id=id, data=data, created_at=datetime(2025, 4, 1, tzinfo=timezone.utc))
+
+
+def expand_compact(columns, rows):
+    """Rebuild full-format rows from a compact response, as the frontend does"""
+    return [
+        {'id': id, 'created_at': created_at, 'data': {
+            column: values[index] for index, column in enumerate(columns) if index not in missing
+        }}
+        for id, created_at, values, missing in rows
+    ]
+
+
+class CompactRowsTests(SimpleTestCase):
+    entries = [
+        make_entry(1, {'IEC': '1', 'Product': 'Tea', 'Port': None}),
+        make_entry(2, {'Product': 'Coffee'}),
+        make_entry(3, {'Product': 'Rice', 'Extra': 'x'}),
+    ]
+
+    def test_columns_follow_file_header(self):
+        self.assertEqual(_compact_columns(['Product', 'IEC', 'Port'], self.entries[:2]), ['Product', 'IEC', 'Port'])
+
+    def test_values_follow_columns(self):
+        rows = _compact_rows(['Product', 'IEC', 'Port'], self.entries[:1])
+        self.assertEqual(rows, [[1, '2025-04-01T00:00:00+00:00', ['Tea', '1', None], []]])
+
+    def test_missing_differs_from_null(self):
+        rows = _compact_rows(['Product', 'IEC', 'Port'], self.entries[:2])
+        self.assertEqual(rows[0][3], [])
+        self.assertEqual(rows[1][2], ['Coffee', None, None])
+        self.assertEqual(rows[1][3], [1, 2])
+
+    def test_keeps_keys_missing_from_header(self):
+        columns = _compact_columns(['Product', 'IEC', 'Port'], self.entries)
+        self.assertEqual(columns, ['Product', 'IEC', 'Port', 'Extra'])
+        self.assertEqual(_compact_rows(columns, self.entries)[2][2], ['Rice', None, None, 'x'])
+
+    def test_round_trips_to_full_format(self):
+        columns = _compact_columns(['Product'], self.entries)
+        expanded = expand_compact(columns, _compact_rows(columns, self.entries))
+        full = [
+            {'id': entry.id, 'created_at': entry.created_at.isoformat(), 'data': entry.data}
+            for entry in self.entries
+        ]
+        self.assertEqual(expanded, full)
+
+
+class ChooseEncodingTests(SimpleTestCase):
+    def test_prefers_brotli(self):
+        self.assertEqual(choose_encoding('gzip, deflate, br'), 'br')
+
+    def test_honours_q_values(self):
+        self.assertEqual(choose_encoding('br;q=0.5, gzip'), 'gzip')
+        self.assertIsNone(choose_encoding('gzip;q=0'))
+        self.assertIsNone(choose_encoding('br;q=0, gzip;q=0'))
+
+    def test_wildcard(self):
+        self.assertEqual(choose_encoding('*'), 'br')
+        self.assertEqual(choose_encoding('br;q=0, *'), 'gzip')
+
+    def test_no_supported_encoding(self):
+        self.assertIsNone(choose_encoding(''))
+        self.assertIsNone(choose_encoding('deflate, identity'))
+
+
+class SearchCachingTests(TestCase):
+    def setUp(self):
+        self.file_info = FileInfo.objects.create(filename='data.csv', columns=['Product', 'Port'])
+        _create_entries(self.file_info, [
+            DataEntry(data=row, search_document=build_search_document(row), file=self.file_info)
+            for row in [{'Product': f'Tea {i}', 'Port': 'Mundra'} for i in range(30)]
+        ])
+        self.params = {
+            'search_terms': 'tea',
+            'fields': 'Product',
+            'file_id': self.file_info.id,
+            'format': 'compact',
+        }
+
+    def search(self, **headers):
+        return self.client.get(reverse('search_data'), self.params, **headers)
+
+    def test_get_returns_etag(self):
+        response = self.search()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.search()['ETag']
+        self.assertEqual(self.search(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_etag_changes_when_entries_are_added(self):
+        etag = self.search()['ETag']
+        row = {'Product': 'Tea late', 'Port': 'Mundra'}
+        _create_entries(self.file_info, [
+            DataEntry(data=row, search_document=build_search_document(row), file=self.file_info)
+        ])
+        response = self.search(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['total_count'], 31)
+
+    def test_post_with_matching_etag_fails_precondition(self):
+        etag = self.search()['ETag']
+        response = self.client.post(
+            reverse('search_data'),
+            {'search_terms': ['tea'], 'fields': ['Product'], 'file_id': self.file_info.id, 'format': 'compact'},
+            content_type='application/json',
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 412)
+
+    def test_compresses_with_brotli(self):
+        response = self.search(HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/'))
+        plain = self.search().json()
+        self.assertEqual(orjson_loads(brotli.decompress(response.content)), plain)
+
+    def test_skips_refused_gzip(self):
+        response = self.search(HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class SearchDataViewTests(TestCase):
+    def setUp(self):
+        self.file_info = FileInfo.objects.create(filename='data.csv', columns=['Product', 'Foreign Company'])
+        rows = [
+            {'Product': 'Café Crème', 'Foreign Company': 'Acme'},
+            {'Product': 'Tea', 'Foreign Company': 'Café Holdings'},
+            {'Product': 'Rice', 'Foreign Company': 'Globex'},
+        ]
+        _create_entries(self.file_info, [
+            DataEntry(data=row, search_document=build_search_document(row), file=self.file_info)
+            for row in rows
+        ])
+
+    def search(self, **params):
+        params.setdefault('file_id', self.file_info.id)
+        return self.client.post(reverse('search_data'), params, content_type='application/json')
+
+    def products(self, response):
+        return sorted(result['data']['Product'] for result in response.json()['results'])
+
+    def test_rejects_unknown_mode(self):
+        response = self.search(search_terms=['tea'], fields=['Product'], search_mode='all')
+        self.assertEqual(response.status_code, 400)
+
+    def test_fields_required_in_fields_mode(self):
+        self.assertEqual(self.search(search_terms=['tea']).status_code, 400)
+
+    def test_any_mode_without_fields(self):
+        response = self.search(search_terms=['cafe'], search_mode='any')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.products(response), ['Café Crème', 'Tea'])
+
+    def test_fields_mode_restricts_columns_with_same_folding(self):
+        response = self.search(search_terms=['CAFE'], fields=['Product'])
+        self.assertEqual(self.products(response), ['Café Crème'])
+        response = self.search(search_terms=['cafe'], fields=['ForeignCompany'])
+        self.assertEqual(self.products(response), ['Tea'])
+
+    def test_terms_must_all_match(self):
+        response = self.search(search_terms=['cafe', 'acme'], search_mode='any')
+        self.assertEqual(self.products(response), ['Café Crème'])
+
+    def test_rejects_terms_without_text(self):
+        for term in ['   ', '\x1f', '\t']:
+            response = self.search(search_terms=['tea', term], search_mode='any')
+            self.assertEqual(response.status_code, 400, repr(term))
+
+
+class UploadFileTests(TestCase):
+    def test_csv_upload_builds_search_documents(self):
+        upload = SimpleUploadedFile(
+            'data.csv',
+            'Product,Indian Port\nCafé  Crème,Mundra\nTea,\n'.encode('utf-8'),
+            content_type='text/csv'
+        )
+        response = self.client.post(reverse('upload_file'), {'file': upload})
+        self.assertEqual(response.status_code, 200)
+
+        file_info = FileInfo.objects.get(id=response.json()['file_id'])
+        self.assertEqual(file_info.columns, ['Product', 'Indian Port'])
+        self.assertEqual(file_info.row_count, 2)
+        self.assertGreater(file_info.version, 0)
+        documents = sorted(file_info.entries.values_list('search_document', flat=True))
+        self.assertEqual(documents, [
+            '\x1fproduct\x1ecafe creme\x1findianport\x1emundra\x1f',
+            '\x1fproduct\x1etea\x1findianport\x1e\x1f',
+        ])
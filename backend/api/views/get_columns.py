@@ -1,7 +1,7 @@
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from ..models import DataEntry, FileInfo
+from ..models import FileInfo
 from .state import upload_progress, active_file_id
 
 @csrf_exempt
@@ -17,11 +17,10 @@ def get_columns(request):
 
         if active_file_id:
             file_info = FileInfo.objects.get(id=active_file_id)
-            sample_entry = DataEntry.objects.filter(file=file_info).first()
             
-            if sample_entry:
+            if file_info.columns:
                 return JsonResponse({
-                    'columns': list(sample_entry.data.keys()),
+                    'columns': file_info.columns,
                     'current_file': file_info.filename
                 })
 
@@ -1,29 +1,124 @@
+import hashlib
 import json
-from django.http import JsonResponse
+import orjson
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import etag, require_http_methods
 from django.db.models import Q
 from ..models import DataEntry, FileInfo
+from ..search_document import normalize_search_text, search_pattern
+
+
+def _search_params(request):
+    """Read search parameters from the query string (GET) or the JSON body (POST)"""
+    if request.method == 'GET':
+        return {
+            'search_terms': request.GET.getlist('search_terms'),
+            'fields': request.GET.getlist('fields'),
+            'page': int(request.GET.get('page', 1)),
+            'page_size': int(request.GET.get('page_size', 20)),
+            'file_id': request.GET.get('file_id'),
+            'format': request.GET.get('format', 'full'),
+            'search_mode': request.GET.get('search_mode', 'fields'),
+        }
+
+    data = json.loads(request.body)
+    return {
+        'search_terms': data.get('search_terms', []),
+        'fields': data.get('fields', []),
+        'page': data.get('page', 1),
+        'page_size': data.get('page_size', 20),
+        'file_id': data.get('file_id'),
+        'format': data.get('format', 'full'),
+        'search_mode': data.get('search_mode', 'fields'),
+    }
+
+
+def _search_etag(request):
+    """ETag keyed on the file version and the search parameters.
+
+    The version changes with every chunk an upload inserts, so results
+    cached while a file is still being uploaded are revalidated.
+    """
+    try:
+        params = _search_params(request)
+        file_info = FileInfo.objects.only('id', 'version', 'columns').get(id=params['file_id'])
+    except (ValueError, FileInfo.DoesNotExist):
+        return None
+
+    # file_id arrives as a string in a query string, so key on the resolved id
+    del params['file_id']
+    key = orjson.dumps({
+        'file': [file_info.id, file_info.version, file_info.columns],
+        'params': params,
+    }, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha1(key).hexdigest()
+
+
+def _compact_columns(columns, entries):
+    """Return columns followed by any keys of entries that columns does not list"""
+    columns = list(columns)
+    known = set(columns)
+    for entry in entries:
+        for key in entry.data:
+            if key not in known:
+                known.add(key)
+                columns.append(key)
+    return columns
+
+
+def _compact_rows(columns, entries):
+    """Return one [id, created_at, values, missing] array per entry.
+
+    values follows the order of columns; missing lists the indexes of columns
+    the entry has no key for, so they can be told apart from real nulls.
+    """
+    rows = []
+    for entry in entries:
+        values = []
+        missing = []
+        for index, column in enumerate(columns):
+            if column in entry.data:
+                values.append(entry.data[column])
+            else:
+                values.append(None)
+                missing.append(index)
+        rows.append([entry.id, entry.created_at.isoformat(), values, missing])
+    return rows
+
 
 @csrf_exempt
-@require_http_methods(["POST"])
+@require_http_methods(["GET", "POST"])
+@cache_control(private=True, no_cache=True)
+@etag(_search_etag)
 def search_data(request):
     """Search data with pagination and relevance sorting"""
     try:
-        data = json.loads(request.body)
-        search_terms = data.get('search_terms', [])
-        fields = data.get('fields', [])
-        page = data.get('page', 1)
-        page_size = data.get('page_size', 20)
-        file_id = data.get('file_id')
+        params = _search_params(request)
+        search_terms = params['search_terms']
+        fields = params['fields']
+        page = params['page']
+        page_size = params['page_size']
+        file_id = params['file_id']
+        response_format = params['format']
+        search_mode = params['search_mode']
         
-        print(f"Search request - terms: {search_terms}, fields: {fields}, file_id: {file_id}")
-        
-        if not search_terms or not fields:
+        print(f"Search request - terms: {search_terms}, fields: {fields}, mode: {search_mode}, file_id: {file_id}")
+
+        if search_mode not in ('fields', 'any'):
+            return JsonResponse({'error': 'Search mode must be "fields" or "any"'}, status=400)
+
+        if not search_terms or (search_mode == 'fields' and not fields):
             return JsonResponse({
                 'error': 'Search terms and fields are required'
             }, status=400)
             
+        if not all(normalize_search_text(term) for term in search_terms):
+            return JsonResponse({
+                'error': 'Search terms must contain searchable text'
+            }, status=400)
+
         if not file_id:
             return JsonResponse({'error': 'File ID is required'}, status=400)
             
@@ -32,19 +127,22 @@ def search_data(request):
         except FileInfo.DoesNotExist:
             return JsonResponse({'error': 'File not found'}, status=404)
 
+        if response_format not in ('full', 'compact'):
+            return JsonResponse({'error': 'Format must be "full" or "compact"'}, status=400)
+
         query = DataEntry.objects.filter(file=file_info)
         
         search_conditions = Q()
         
+        # Each term is a plain LIKE on the search document, which the trigram
+        # index serves reliably, plus a regex that limits the match to one
+        # column value (the selected columns in fields mode). The regex alone
+        # loses index selectivity once many columns are selected, so it only
+        # rechecks the rows the LIKE finds.
+        pattern_fields = fields if search_mode == 'fields' else None
         for term in search_terms:
-            term_condition = Q()
-            for field in fields:
-                field_variations = [field, field.replace(' ', '')]
-                for field_name in field_variations:
-                    json_field_lookup = f"data__{field_name}__icontains"
-                    term_condition |= Q(**{json_field_lookup: term})
-            
-            search_conditions &= term_condition
+            search_conditions &= Q(search_document__contains=normalize_search_text(term))
+            search_conditions &= Q(search_document__regex=search_pattern(term, pattern_fields))
 
         query = query.filter(search_conditions)
         
@@ -56,33 +154,47 @@ def search_data(request):
         total_pages = (total_count + page_size - 1) // page_size
         offset = (page - 1) * page_size
 
-        results = query[offset:offset + page_size]
-
-        formatted_results = []
-        for entry in results:
-            result = {
-                'id': entry.id,
-                'data': entry.data,
-                'created_at': entry.created_at.isoformat(),
-                'file': entry.file.filename if entry.file else None
-            }
-            formatted_results.append(result)
+        # Every entry belongs to file_info, so its filename is resolved once
+        # here instead of following entry.file for each row
+        results = list(query.only('id', 'data', 'created_at')[offset:offset + page_size])
 
         response_data = {
-            'results': formatted_results,
             'total_count': total_count,
             'total_pages': total_pages,
             'page': page,
             'page_size': page_size
         }
-        
-        print(f"Sending response with {len(formatted_results)} results")
-        return JsonResponse(response_data)
+
+        if response_format == 'compact':
+            columns = _compact_columns(file_info.columns, results)
+            response_data.update({
+                'format': 'compact',
+                'file': file_info.filename,
+                'columns': columns,
+                'rows': _compact_rows(columns, results)
+            })
+        else:
+            response_data['results'] = [
+                {
+                    'id': entry.id,
+                    'data': entry.data,
+                    'created_at': entry.created_at.isoformat(),
+                    'file': file_info.filename
+                }
+                for entry in results
+            ]
+
+        print(f"Sending response with {len(results)} results")
+        return HttpResponse(orjson.dumps(response_data), content_type='application/json')
 
     except json.JSONDecodeError:
         return JsonResponse({
             'error': 'Invalid JSON data'
         }, status=400)
+    except ValueError:
+        return JsonResponse({
+            'error': 'Invalid search parameters'
+        }, status=400)
     except Exception as e:
         print(f"Search error: {str(e)}")
         return JsonResponse({
@@ -22,16 +22,10 @@ def select_file(request):
         file_info.is_active = True
         file_info.save()
         
-        columns = []
-        if file_info.entries.exists():
-            first_entry = file_info.entries.first()
-            if first_entry and first_entry.data:
-                columns = list(first_entry.data.keys())
-        
         return JsonResponse({
             'message': 'File selected successfully',
             'filename': file_info.filename,
-            'columns': columns
+            'columns': file_info.columns
         })
         
     except FileInfo.DoesNotExist:
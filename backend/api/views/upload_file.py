@@ -1,12 +1,20 @@
 import csv
 import io
 
+from django.db.models import F
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from openpyxl import load_workbook
 
 from ..models import DataEntry, FileInfo
+from ..search_document import build_search_document
+
+
+def _create_entries(file_info, entries):
+    """Insert a chunk of entries and bump the file version so cached searches go stale"""
+    DataEntry.objects.bulk_create(entries)
+    FileInfo.objects.filter(id=file_info.id).update(version=F('version') + 1)
 
 
 @csrf_exempt
@@ -53,6 +61,8 @@ def upload_file(request):
             csv_reader = csv.DictReader(io.StringIO(decoded_file))
             columns = [col.strip() for col in csv_reader.fieldnames if col and col.strip()]
             upload_progress['columns'] = columns
+            file_info.columns = list(dict.fromkeys(columns))
+            file_info.save(update_fields=['columns'])
             
             # Process rows in chunks
             for row in csv_reader:
@@ -63,13 +73,17 @@ def upload_file(request):
                 }
                 
                 if cleaned_row:
-                    rows_to_create.append(DataEntry(data=cleaned_row, file=file_info))
+                    rows_to_create.append(DataEntry(
+                        data=cleaned_row,
+                        search_document=build_search_document(cleaned_row),
+                        file=file_info
+                    ))
                     total_rows_processed += 1
                     upload_progress['processed_rows'] = total_rows_processed
                 
                 # When we reach chunk_size, bulk create and reset
                 if len(rows_to_create) >= chunk_size:
-                    DataEntry.objects.bulk_create(rows_to_create)
+                    _create_entries(file_info, rows_to_create)
                     rows_to_create = []
                     
         elif file_name.endswith('.xlsx'):
@@ -86,6 +100,8 @@ def upload_file(request):
             
             columns = [col for col in headers if col]
             upload_progress['columns'] = columns
+            file_info.columns = list(dict.fromkeys(columns))
+            file_info.save(update_fields=['columns'])
             
             # Count total rows (excluding header)
             upload_progress['total_rows'] = ws.max_row - 1
@@ -106,13 +122,17 @@ def upload_file(request):
                         row_data[header] = value.strip()
                 
                 if row_data:
-                    rows_to_create.append(DataEntry(data=row_data, file=file_info))
+                    rows_to_create.append(DataEntry(
+                        data=row_data,
+                        search_document=build_search_document(row_data),
+                        file=file_info
+                    ))
                     total_rows_processed += 1
                     upload_progress['processed_rows'] = total_rows_processed
                 
                 # When we reach chunk_size, bulk create and reset
                 if len(rows_to_create) >= chunk_size:
-                    DataEntry.objects.bulk_create(rows_to_create)
+                    _create_entries(file_info, rows_to_create)
                     rows_to_create = []
             
             # Close the workbook to free memory
@@ -122,11 +142,11 @@ def upload_file(request):
         
         # Bulk create any remaining entries
         if rows_to_create:
-            DataEntry.objects.bulk_create(rows_to_create)
+            _create_entries(file_info, rows_to_create)
         
         # Update file info with final row count
         file_info.row_count = total_rows_processed
-        file_info.save()
+        file_info.save(update_fields=['row_count'])
         
         # Set this as the active file
         global active_file_id
@@ -113,7 +113,9 @@ export async function performSearch(page = 1) {
         return;
     }
 
-    if (selectedFields.length === 0) {
+    const anyColumn = document.getElementById('anyColumnMode').checked;
+
+    if (!anyColumn && selectedFields.length === 0) {
         showNotification('Please select at least one field to search in', 'warning');
         return;
     }
@@ -138,21 +140,26 @@ export async function performSearch(page = 1) {
         const searchParams = {
             search_terms: searchTerms,
             fields: selectedFields,
+            search_mode: anyColumn ? 'any' : 'fields',
             page: currentPage,
             page_size: 20,
-            file_id: getSelectedFileId()
+            file_id: getSelectedFileId(),
+            format: 'compact'
         };
 
         console.log('Search request:', searchParams);
 
-        const response = await fetch('/api/search/', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(searchParams)
+        // A GET lets the browser cache pages and revalidate them with the
+        // server's ETag, so an unchanged page comes back as a 304
+        const query = new URLSearchParams();
+        Object.entries(searchParams).forEach(([key, value]) => {
+            (Array.isArray(value) ? value : [value])
+                .filter(item => item !== null && item !== undefined)
+                .forEach(item => query.append(key, item));
         });
 
+        const response = await fetch(`/api/search/?${query}`);
+
         const data = await response.json();
         console.log('Search response:', data);
 
@@ -163,9 +170,11 @@ export async function performSearch(page = 1) {
         // Store current search parameters for pagination
         currentSearchParams = { search_terms: searchTerms, fields: selectedFields };
 
+        const results = data.format === 'compact' ? expandCompactRows(data) : data.results;
+
         // Display results
-        if (data.results && data.results.length > 0) {
-            displayResults(data.results, data.total_count, searchTerms);
+        if (results && results.length > 0) {
+            displayResults(results, data.total_count, searchTerms);
             if (data.total_pages > 1) {
                 totalPages = data.total_pages;
                 createPagination(currentPage, totalPages);
@@ -179,6 +188,19 @@ export async function performSearch(page = 1) {
     }
 }
 
+// Rebuild per-row objects from the compact columns/rows response
+function expandCompactRows(data) {
+    return data.rows.map(([id, createdAt, values, missing]) => {
+        const rowData = {};
+        data.columns.forEach((column, index) => {
+            if (!missing.includes(index)) {
+                rowData[column] = values[index];
+            }
+        });
+        return { id, data: rowData, created_at: createdAt, file: data.file };
+    });
+}
+
 function displayResults(results, totalCount, searchTerm) {
     if (!resultsDiv) return;
 
@@ -36,6 +36,38 @@ export function formatNumber(num) {
     return num.toString().replace(/\B(?=(\d{3})+(?!\d))/g, ",");
 }
 
+// Fold text the way the backend's search document does: lowercase (with final
+// sigma mapped like casefold), accents stripped and whitespace runs collapsed.
+// starts/ends give the span of the original text behind each folded character.
+function foldText(text) {
+    let folded = '';
+    const starts = [];
+    const ends = [];
+    let index = 0;
+    let previousSpace = false;
+    for (const char of text) {
+        const next = index + char.length;
+        if (/\s/.test(char)) {
+            if (!previousSpace) {
+                folded += ' ';
+                starts.push(index);
+                ends.push(next);
+            }
+            previousSpace = true;
+        } else {
+            previousSpace = false;
+            const foldedChar = char.normalize('NFKD').replace(/\p{M}/gu, '').toLowerCase().replace(/ς/g, 'σ');
+            for (let i = 0; i < foldedChar.length; i++) {
+                starts.push(index);
+                ends.push(next);
+            }
+            folded += foldedChar;
+        }
+        index = next;
+    }
+    return { folded, starts, ends };
+}
+
 export function highlightMatches(text, searchTerm) {
     if (!text || !searchTerm) {
         return text;
@@ -44,26 +76,49 @@ export function highlightMatches(text, searchTerm) {
     // Convert text to string if it isn't already
     text = text.toString();
 
-    // Handle array of search terms
-    if (Array.isArray(searchTerm)) {
-        return searchTerm.reduce((acc, term) => {
-            if (!term || term.trim() === '') {
-                return acc;
-            }
-            const escapedSearchTerm = term.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-            const regex = new RegExp(`(${escapedSearchTerm})`, 'gi');
-            return acc.replace(regex, '<span class="highlight">$1</span>');
-        }, text);
-    }
+    const terms = Array.isArray(searchTerm) ? searchTerm : [searchTerm];
+    const { folded, starts, ends } = foldText(text);
+
+    // Collect the original-text ranges of every folded match
+    const ranges = [];
+    terms.forEach(term => {
+        if (typeof term !== 'string') {
+            return;
+        }
+        const needle = foldText(term).folded.trim();
+        if (!needle) {
+            return;
+        }
+        let position = folded.indexOf(needle);
+        while (position !== -1) {
+            ranges.push([starts[position], ends[position + needle.length - 1]]);
+            position = folded.indexOf(needle, position + needle.length);
+        }
+    });
 
-    // Handle single search term
-    if (typeof searchTerm === 'string' && searchTerm.trim() !== '') {
-        const escapedSearchTerm = searchTerm.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-        const regex = new RegExp(`(${escapedSearchTerm})`, 'gi');
-        return text.replace(regex, '<span class="highlight">$1</span>');
+    if (ranges.length === 0) {
+        return text;
     }
 
-    return text;
+    // Merge overlapping ranges so highlights never nest
+    ranges.sort((a, b) => a[0] - b[0]);
+    const merged = [ranges[0]];
+    ranges.slice(1).forEach(([start, end]) => {
+        const last = merged[merged.length - 1];
+        if (start <= last[1]) {
+            last[1] = Math.max(last[1], end);
+        } else {
+            merged.push([start, end]);
+        }
+    });
+
+    let result = '';
+    let cursor = 0;
+    merged.forEach(([start, end]) => {
+        result += text.slice(cursor, start) + '<span class="highlight">' + text.slice(start, end) + '</span>';
+        cursor = end;
+    });
+    return result + text.slice(cursor);
 }
 
 export function initializeUI() {